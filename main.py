@@ -1,38 +1,104 @@
 import os
-from fastapi import FastAPI, HTTPException
+import asyncio
+import hashlib
+import logging
+from collections import Counter
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing import List, Optional, Dict, Any, Type
 from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, ReturnDocument
 from datetime import datetime, timezone
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+from redis import asyncio as aioredis
 
-from database import db, create_document, get_documents
-from schemas import Room, Participant, Assignment
+from database import db, create_document, create_documents, get_documents, stream_documents
+from schemas import OID_RE, StayDays, Room, Participant, Assignment
 
-app = FastAPI(title="Retraite - Gestion Hébergements")
+class MongoJSONResponse(ORJSONResponse):
+    """orjson response that also encodes ObjectId values and int dict keys"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _orjson_default(o):
+    if isinstance(o, ObjectId):
+        return str(o)
+    raise TypeError
+
+
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="Retraite - Gestion Hébergements", default_response_class=MongoJSONResponse)
+
+_ETAG_PATHS = frozenset({"/rooms", "/participants", "/summary"})
+
+
+# Registered before GZip so the tag is computed on the uncompressed body
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    response = await call_next(request)
+    if request.method != "GET" or request.url.path not in _ETAG_PATHS or response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    # Weak: GZip may re-encode the body, and strong tags must differ per content coding
+    opaque = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": f"W/{opaque}", "Cache-Control": "max-age=15"}
+    if_none_match = request.headers.get("if-none-match", "")
+    # If-None-Match uses weak comparison: ignore W/ prefixes, "*" matches anything
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in tags or opaque in tags:
+        return Response(status_code=304, headers=headers)
+
+    # Keep the original headers (same body, so content-length still holds) but
+    # replace, not duplicate, any ETag / Cache-Control set by fastapi-cache
+    conditional = Response(content=body, status_code=response.status_code)
+    conditional.raw_headers = response.raw_headers
+    for name, value in headers.items():
+        conditional.headers[name] = value
+    return conditional
+
+# Comma separated list of allowed front-end origins, e.g. "https://app.example.org,http://localhost:3000"
+cors_origins = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Content-Type", "Authorization"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=500)
 
 
 # Helpers
-class ObjectIdStr(str):
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+_DAYS = frozenset({1, 2, 3})
+_STAY_DAYS = TypeAdapter(StayDays)
 
-    @classmethod
-    def validate(cls, v):
-        try:
-            ObjectId(str(v))
-            return str(v)
-        except Exception:
-            raise ValueError("Invalid ObjectId string")
+# Set by create_document on every collection, selectable through ?fields=
+_TIMESTAMP_FIELDS = frozenset({"created_at", "updated_at"})
+
+# Fields each PUT endpoint accepts
+_ALLOWED_ROOM = frozenset({"name", "capacity", "gender", "type", "cooling", "amenities"})
+_ALLOWED_PARTICIPANT = frozenset({"full_name", "email", "phone", "gender", "parish", "special_needs", "preference"})
+_ALLOWED_ASSIGNMENT = frozenset({"participant_id", "room_id", "stay_days"})
+
+
+def to_oid(value: Any, detail: str = "Identifiant invalide") -> ObjectId:
+    """Parse a hex ObjectId, rejecting malformed input without going through bson's exception path"""
+    s = str(value)
+    if not OID_RE.fullmatch(s):
+        raise HTTPException(status_code=400, detail=detail)
+    return ObjectId(s)
 
 
 def to_str_id(doc):
@@ -44,17 +110,114 @@ def to_str_id(doc):
     return d
 
 
+def with_ids(docs):
+    """Rename _id to id in place; ObjectId values are encoded by MongoJSONResponse"""
+    for d in docs:
+        if "_id" in d:
+            d["id"] = d.pop("_id")
+    return docs
+
+
+async def stream_json_array(batches):
+    """Encode batches of documents as one JSON array, one chunk per batch"""
+    yield b"["
+    first = True
+    async for docs in batches:
+        # Drop the surrounding brackets so batches splice into a single array
+        chunk = orjson.dumps(with_ids(docs), default=_orjson_default)[1:-1]
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]"
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[Dict[str, int]]:
+    """Turn a comma separated ?fields= value into a MongoDB projection over `model`'s fields"""
+    if not fields:
+        return None
+    names = {f.strip() for f in fields.split(",") if f.strip()} - {"id"}
+    unknown = names - model.model_fields.keys() - _TIMESTAMP_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Champs inconnus: {', '.join(sorted(unknown))}")
+    return {name: 1 for name in names} or {"_id": 1}
+
+
+async def invalidate(*namespaces: str):
+    """Drop cached GET responses after a write"""
+    for namespace in namespaces:
+        try:
+            await FastAPICache.clear(namespace=namespace)
+        except Exception as e:
+            # The write already went through; a stale cache only lasts until expiry
+            logger.warning("Could not clear %s cache: %s", namespace, e)
+
+
 def now_utc():
     return datetime.now(timezone.utc)
 
 
+def days_mask(days: List[int]) -> int:
+    """Pack retreat days into the stay_days_mask bitmask (bit 0 = day 1)"""
+    mask = 0
+    for d in days:
+        mask |= 1 << (d - 1)
+    return mask
+
+
+def _day_bit(day: int) -> Dict[str, Any]:
+    # 1 if `day` is set in stay_days_mask, else 0 ($bitAnd would need MongoDB 6.3).
+    # $divide always yields a double, so cast back to keep the counts integral.
+    return {"$toInt": {"$mod": [{"$floor": {"$divide": ["$stay_days_mask", 1 << (day - 1)]}}, 2]}}
+
+
+async def room_day_counts(match: Dict[str, Any]) -> Dict[ObjectId, Dict[int, int]]:
+    """Count the assignments selected by `match` per room and day in one round-trip"""
+    pipeline = [
+        {"$match": match},
+        {"$group": {"_id": "$room_id", **{f"d{d}": {"$sum": _day_bit(d)} for d in _DAYS}}},
+    ]
+    return {row["_id"]: {d: row[f"d{d}"] for d in _DAYS} async for row in db.assignment.aggregate(pipeline)}
+
+
+async def day_counts(room_id: ObjectId, days: List[int], exclude_id: Optional[ObjectId] = None) -> Dict[int, int]:
+    """Count existing assignments of a room for each of the given days"""
+    match: Dict[str, Any] = {"room_id": room_id, "stay_days_mask": {"$bitsAnySet": days_mask(days)}}
+    if exclude_id is not None:
+        match["_id"] = {"$ne": exclude_id}
+    counts = await room_day_counts(match)
+    return counts.get(room_id, {})
+
+
+@app.on_event("startup")
+async def init_cache():
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        FastAPICache.init(RedisBackend(aioredis.from_url(redis_url)), prefix="retraite")
+    else:
+        FastAPICache.init(InMemoryBackend(), prefix="retraite")
+
+
+@app.on_event("startup")
+async def ensure_indexes():
+    if db is None:
+        return
+    # (room_id, stay_days_mask) serves the per-day capacity check and, by prefix, room_id lookups
+    try:
+        await db.assignment.create_indexes([
+            IndexModel([("room_id", ASCENDING), ("stay_days_mask", ASCENDING)]),
+            IndexModel([("participant_id", ASCENDING)]),
+        ])
+    except Exception as e:
+        # Keep serving without indexes; /test reports the database state
+        logger.warning("Could not create assignment indexes: %s", e)
+
+
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "API Gestion Hébergements - Retraite 3 jours"}
 
 
 @app.get("/test")
-def test_database():
+async def test_database():
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -71,7 +234,7 @@ def test_database():
             response["database_name"] = db.name if hasattr(db, 'name') else "✅ Connected"
             response["connection_status"] = "Connected"
             try:
-                collections = db.list_collection_names()
+                collections = await db.list_collection_names()
                 response["collections"] = collections[:10]
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
@@ -86,101 +249,97 @@ def test_database():
 
 # ---------------- Rooms ----------------
 @app.post("/rooms")
-def create_room(room: Room):
-    room_id = create_document("room", room)
+async def create_room(room: Room):
+    room_id = await create_document("room", room)
+    await invalidate("rooms", "summary")
     return {"id": room_id}
 
 
 @app.get("/rooms")
-def list_rooms():
-    docs = get_documents("room")
-    return [to_str_id(d) for d in docs]
+@cache(expire=30, namespace="rooms")
+async def list_rooms(fields: Optional[str] = None):
+    docs = await get_documents("room", projection=parse_fields(fields, Room))
+    return MongoJSONResponse(with_ids(docs))
 
 
 @app.put("/rooms/{room_id}")
-def update_room(room_id: str, payload: Dict[str, Any]):
+async def update_room(room_id: str, payload: Dict[str, Any]):
     # Validate id
-    try:
-        rid = ObjectId(room_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Identifiant invalide")
+    rid = to_oid(room_id)
 
     # Only allow known fields
-    allowed = {"name", "capacity", "gender", "type", "cooling", "amenities"}
-    data = {k: v for k, v in payload.items() if k in allowed}
+    data = {k: payload[k] for k in payload.keys() & _ALLOWED_ROOM}
     if not data:
         raise HTTPException(status_code=400, detail="Aucun champ à mettre à jour")
 
-    res = db.room.update_one({"_id": rid}, {"$set": {**data, "updated_at": now_utc()}})
-    if res.matched_count == 0:
+    doc = await db.room.find_one_and_update(
+        {"_id": rid}, {"$set": {**data, "updated_at": now_utc()}}, return_document=ReturnDocument.AFTER
+    )
+    if doc is None:
         raise HTTPException(status_code=404, detail="Chambre introuvable")
-    doc = db.room.find_one({"_id": rid})
+    await invalidate("rooms", "summary")
     return to_str_id(doc)
 
 
 @app.delete("/rooms/{room_id}")
-def delete_room(room_id: str):
-    try:
-        rid = ObjectId(room_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Identifiant invalide")
+async def delete_room(room_id: str):
+    rid = to_oid(room_id)
 
     # Prevent deletion if assignments exist
-    if db.assignment.count_documents({"room_id": str(rid)}) > 0:
+    if await db.assignment.count_documents({"room_id": rid}) > 0:
         raise HTTPException(status_code=409, detail="Impossible de supprimer: des attributions existent")
 
-    res = db.room.delete_one({"_id": rid})
+    res = await db.room.delete_one({"_id": rid})
     if res.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Chambre introuvable")
+    await invalidate("rooms", "summary")
     return {"status": "deleted"}
 
 
 # ---------------- Participants ----------------
 @app.post("/participants")
-def create_participant(participant: Participant):
-    participant_id = create_document("participant", participant)
+async def create_participant(participant: Participant):
+    participant_id = await create_document("participant", participant)
+    await invalidate("participants", "summary")
     return {"id": participant_id}
 
 
 @app.get("/participants")
-def list_participants():
-    docs = get_documents("participant")
-    return [to_str_id(d) for d in docs]
+@cache(expire=30, namespace="participants")
+async def list_participants(fields: Optional[str] = None):
+    docs = await get_documents("participant", projection=parse_fields(fields, Participant))
+    return MongoJSONResponse(with_ids(docs))
 
 
 @app.put("/participants/{participant_id}")
-def update_participant(participant_id: str, payload: Dict[str, Any]):
-    try:
-        pid = ObjectId(participant_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Identifiant invalide")
+async def update_participant(participant_id: str, payload: Dict[str, Any]):
+    pid = to_oid(participant_id)
 
-    allowed = {"full_name", "email", "phone", "gender", "parish", "special_needs", "preference"}
-    data = {k: v for k, v in payload.items() if k in allowed}
+    data = {k: payload[k] for k in payload.keys() & _ALLOWED_PARTICIPANT}
     if not data:
         raise HTTPException(status_code=400, detail="Aucun champ à mettre à jour")
 
-    res = db.participant.update_one({"_id": pid}, {"$set": {**data, "updated_at": now_utc()}})
-    if res.matched_count == 0:
+    doc = await db.participant.find_one_and_update(
+        {"_id": pid}, {"$set": {**data, "updated_at": now_utc()}}, return_document=ReturnDocument.AFTER
+    )
+    if doc is None:
         raise HTTPException(status_code=404, detail="Participant introuvable")
-    doc = db.participant.find_one({"_id": pid})
+    await invalidate("participants", "summary")
     return to_str_id(doc)
 
 
 @app.delete("/participants/{participant_id}")
-def delete_participant(participant_id: str):
-    try:
-        pid = ObjectId(participant_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Identifiant invalide")
+async def delete_participant(participant_id: str):
+    pid = to_oid(participant_id)
 
     # Prevent deletion if assignments exist
-    if db.assignment.count_documents({"participant_id": str(pid)}) > 0:
+    if await db.assignment.count_documents({"participant_id": pid}) > 0:
         raise HTTPException(status_code=409, detail="Impossible de supprimer: des attributions existent")
 
-    res = db.participant.delete_one({"_id": pid})
+    res = await db.participant.delete_one({"_id": pid})
     if res.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Participant introuvable")
+    await invalidate("participants", "summary")
     return {"status": "deleted"}
 
 
@@ -190,116 +349,179 @@ class AssignmentIn(Assignment):
 
 
 @app.post("/assignments")
-def create_assignment(assignment: AssignmentIn):
-    # Basic validation for days subset
-    for d in assignment.stay_days:
-        if d not in [1, 2, 3]:
-            raise HTTPException(status_code=400, detail="Les jours doivent être parmi 1,2,3")
-
+async def create_assignment(assignment: AssignmentIn):
     # Check room and participant exist
-    try:
-        pid = ObjectId(assignment.participant_id)
-        rid = ObjectId(assignment.room_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Identifiants invalides")
-
-    if db.participant.find_one({"_id": pid}) is None:
+    pid = to_oid(assignment.participant_id, "Identifiants invalides")
+    rid = to_oid(assignment.room_id, "Identifiants invalides")
+
+    # Existence checks and occupancy counts are independent: run them concurrently
+    participant, room, counts = await asyncio.gather(
+        db.participant.find_one({"_id": pid}, {"_id": 1}),
+        db.room.find_one({"_id": rid}, {"capacity": 1}),
+        day_counts(rid, assignment.stay_days),
+    )
+    if participant is None:
         raise HTTPException(status_code=404, detail="Participant introuvable")
-    if db.room.find_one({"_id": rid}) is None:
+    if room is None:
         raise HTTPException(status_code=404, detail="Chambre introuvable")
 
     # Occupancy check per day against room capacity
-    room = db.room.find_one({"_id": rid})
     for day in assignment.stay_days:
-        count = db.assignment.count_documents({"room_id": str(rid), "stay_days": day})
-        if count >= room.get("capacity", 0):
+        if counts.get(day, 0) >= room.get("capacity", 0):
             raise HTTPException(status_code=409, detail=f"Capacité atteinte pour le jour {day}")
 
-    assignment_id = create_document("assignment", assignment)
+    assignment_id = await create_document(
+        "assignment",
+        {**assignment.model_dump(), "participant_id": pid, "room_id": rid, "stay_days_mask": days_mask(assignment.stay_days)},
+    )
+    await invalidate("summary")
     return {"id": assignment_id}
 
 
+@app.post("/assignments/bulk")
+async def create_assignments_bulk(items: List[AssignmentIn]):
+    if not items:
+        raise HTTPException(status_code=400, detail="Aucune attribution à créer")
+
+    refs = [(to_oid(item.participant_id, "Identifiants invalides"), to_oid(item.room_id, "Identifiants invalides")) for item in items]
+    pids = {pid for pid, _ in refs}
+    rids = {rid for _, rid in refs}
+
+    mask = days_mask([d for item in items for d in item.stay_days])
+    occ_match = {"room_id": {"$in": list(rids)}, "stay_days_mask": {"$bitsAnySet": mask}}
+    participants, rooms, occ = await asyncio.gather(
+        db.participant.find({"_id": {"$in": list(pids)}}, {"_id": 1}).to_list(length=None),
+        db.room.find({"_id": {"$in": list(rids)}}, {"capacity": 1}).to_list(length=None),
+        room_day_counts(occ_match),
+    )
+    if len(participants) != len(pids):
+        raise HTTPException(status_code=404, detail="Participant introuvable")
+    if len(rooms) != len(rids):
+        raise HTTPException(status_code=404, detail="Chambre introuvable")
+
+    # Occupancy check per (room, day), counting the items of this batch as they are placed
+    capacity = {r["_id"]: r.get("capacity", 0) for r in rooms}
+    counts = Counter({(r, d): n for r, per_day in occ.items() for d, n in per_day.items()})
+    for item, (_, rid) in zip(items, refs):
+        for day in item.stay_days:
+            key = (rid, day)
+            if counts[key] >= capacity[rid]:
+                raise HTTPException(status_code=409, detail=f"Capacité atteinte pour le jour {day}")
+            counts[key] += 1
+
+    ids = await create_documents(
+        "assignment",
+        [
+            {**item.model_dump(), "participant_id": pid, "room_id": rid, "stay_days_mask": days_mask(item.stay_days)}
+            for item, (pid, rid) in zip(items, refs)
+        ],
+    )
+    await invalidate("summary")
+    return {"ids": ids}
+
+
 @app.get("/assignments")
-def list_assignments(room_id: Optional[str] = None, day: Optional[int] = None):
+async def list_assignments(
+    room_id: Optional[str] = None, day: Optional[int] = Query(None, ge=1, le=3), fields: Optional[str] = None
+):
     query: Dict[str, Any] = {}
     if room_id:
-        query["room_id"] = room_id
+        query["room_id"] = to_oid(room_id)
     if day:
-        query["stay_days"] = day
-    docs = get_documents("assignment", query)
-    return [to_str_id(d) for d in docs]
+        query["stay_days_mask"] = {"$bitsAllSet": 1 << (day - 1)}
+    batches = stream_documents("assignment", query, projection=parse_fields(fields, Assignment))
+    return StreamingResponse(stream_json_array(batches), media_type="application/json")
 
 
 @app.put("/assignments/{assignment_id}")
-def update_assignment(assignment_id: str, payload: Dict[str, Any]):
-    try:
-        aid = ObjectId(assignment_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Identifiant invalide")
+async def update_assignment(assignment_id: str, payload: Dict[str, Any]):
+    aid = to_oid(assignment_id)
 
-    doc = db.assignment.find_one({"_id": aid})
+    doc = await db.assignment.find_one({"_id": aid})
     if not doc:
         raise HTTPException(status_code=404, detail="Attribution introuvable")
 
-    allowed = {"participant_id", "room_id", "stay_days"}
-    data = {k: v for k, v in payload.items() if k in allowed}
+    data = {k: payload[k] for k in payload.keys() & _ALLOWED_ASSIGNMENT}
     if not data:
         raise HTTPException(status_code=400, detail="Aucun champ à mettre à jour")
 
     # If participant or room changes, validate existence
     participant_id = data.get("participant_id", doc.get("participant_id"))
     room_id = data.get("room_id", doc.get("room_id"))
-    stay_days = data.get("stay_days", doc.get("stay_days", []))
 
-    try:
-        pid = ObjectId(str(participant_id))
-        rid = ObjectId(str(room_id))
-    except Exception:
-        raise HTTPException(status_code=400, detail="Identifiants invalides")
+    pid = to_oid(participant_id, "Identifiants invalides")
+    rid = to_oid(room_id, "Identifiants invalides")
 
-    if db.participant.find_one({"_id": pid}) is None:
+    # Validate days with the same type as Assignment.stay_days; keep the coerced
+    # ints (e.g. 2.0 -> 2) so the bitmask is built from real integers
+    if "stay_days" in data:
+        try:
+            data["stay_days"] = _STAY_DAYS.validate_python(data["stay_days"])
+        except ValidationError:
+            raise HTTPException(status_code=400, detail="Les jours doivent être parmi 1,2,3")
+    stay_days = data.get("stay_days", doc.get("stay_days", []))
+
+    participant, room, counts = await asyncio.gather(
+        db.participant.find_one({"_id": pid}, {"_id": 1}),
+        db.room.find_one({"_id": rid}, {"capacity": 1}),
+        day_counts(rid, stay_days, exclude_id=aid),
+    )
+    if participant is None:
         raise HTTPException(status_code=404, detail="Participant introuvable")
-    room = db.room.find_one({"_id": rid})
     if room is None:
         raise HTTPException(status_code=404, detail="Chambre introuvable")
 
-    # Validate days
-    for d in stay_days:
-        if d not in [1, 2, 3]:
-            raise HTTPException(status_code=400, detail="Les jours doivent être parmi 1,2,3")
-
     # Occupancy check per day against room capacity considering this assignment moves
     for day in stay_days:
-        count = db.assignment.count_documents({"room_id": str(rid), "stay_days": day, "_id": {"$ne": aid}})
-        if count >= room.get("capacity", 0):
+        if counts.get(day, 0) >= room.get("capacity", 0):
             raise HTTPException(status_code=409, detail=f"Capacité atteinte pour le jour {day}")
 
-    res = db.assignment.update_one({"_id": aid}, {"$set": {**data, "updated_at": now_utc()}})
-    doc2 = db.assignment.find_one({"_id": aid})
-    return to_str_id(doc2)
+    if "stay_days" in data:
+        data["stay_days_mask"] = days_mask(data["stay_days"])
+    if "participant_id" in data:
+        data["participant_id"] = pid
+    if "room_id" in data:
+        data["room_id"] = rid
+    doc2 = await db.assignment.find_one_and_update(
+        {"_id": aid}, {"$set": {**data, "updated_at": now_utc()}}, return_document=ReturnDocument.AFTER
+    )
+    if doc2 is None:
+        raise HTTPException(status_code=404, detail="Attribution introuvable")
+    await invalidate("summary")
+    return MongoJSONResponse(to_str_id(doc2))
 
 
 @app.delete("/assignments/{assignment_id}")
-def delete_assignment(assignment_id: str):
-    try:
-        aid = ObjectId(assignment_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Identifiant invalide")
+async def delete_assignment(assignment_id: str):
+    aid = to_oid(assignment_id)
 
-    res = db.assignment.delete_one({"_id": aid})
+    res = await db.assignment.delete_one({"_id": aid})
     if res.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Attribution introuvable")
+    await invalidate("summary")
     return {"status": "deleted"}
 
 
 # ---------------- Summary / Dashboard ----------------
 @app.get("/summary")
-def summary():
-    rooms = list(db.room.find())
-    participants = list(db.participant.find())
+@cache(expire=30, namespace="summary")
+async def summary():
+    # One round-trip per collection, all three issued concurrently
+    room_pipeline = [{"$facet": {
+        "rooms": [{"$project": {"capacity": 1, "name": 1, "cooling": 1, "type": 1}}],
+        "by_cooling": [{"$group": {"_id": {"$ifNull": ["$cooling", "ventilated"]}, "n": {"$sum": 1}}}],
+        "by_type": [{"$group": {"_id": "$type", "n": {"$sum": 1}}}],
+    }}]
+    gender_pipeline = [{"$group": {"_id": {"$ifNull": ["$gender", "unknown"]}, "n": {"$sum": 1}}}]
+    room_facets, occ, genders = await asyncio.gather(
+        db.room.aggregate(room_pipeline).to_list(length=1),
+        room_day_counts({"stay_days_mask": {"$bitsAnySet": days_mask(_DAYS)}}),
+        db.participant.aggregate(gender_pipeline).to_list(length=None),
+    )
+    rooms = room_facets[0]["rooms"]
 
     # Build occupancy per room per day
-    occupancy: Dict[str, Dict[str, Any]] = {}
+    occupancy: Dict[ObjectId, Dict[Any, Any]] = {}
     per_day_totals = {1: 0, 2: 0, 3: 0}
     per_day_capacity = {1: 0, 2: 0, 3: 0}
 
@@ -307,36 +529,32 @@ def summary():
     type_counts = {"dorm": 0, "double": 0, "private": 0}
 
     for r in rooms:
-        rid = str(r["_id"])
-        occupancy[rid] = {1: 0, 2: 0, 3: 0, "capacity": r.get("capacity", 0), "name": r.get("name"), "cooling": r.get("cooling", "ventilated"), "type": r.get("type")}
+        occupancy[r["_id"]] = {1: 0, 2: 0, 3: 0, "capacity": r.get("capacity", 0), "name": r.get("name"), "cooling": r.get("cooling", "ventilated"), "type": r.get("type")}
         # capacity is available every day equally
-        for d in [1, 2, 3]:
+        for d in _DAYS:
             per_day_capacity[d] += r.get("capacity", 0)
-        cooling = r.get("cooling", "ventilated")
-        if cooling in cooling_counts:
-            cooling_counts[cooling] += 1
-        t = r.get("type")
-        if t in type_counts:
-            type_counts[t] += 1
-
-    for a in db.assignment.find():
-        rid = a.get("room_id")
-        for d in a.get("stay_days", []):
-            if rid in occupancy and d in [1, 2, 3]:
-                occupancy[rid][d] += 1
-                per_day_totals[d] += 1
-
-    total_participants = len(participants)
+    for row in room_facets[0]["by_cooling"]:
+        if row["_id"] in cooling_counts:
+            cooling_counts[row["_id"]] += row["n"]
+    for row in room_facets[0]["by_type"]:
+        if row["_id"] in type_counts:
+            type_counts[row["_id"]] += row["n"]
+
+    for rid, per_day in occ.items():
+        if rid in occupancy:
+            for d, n in per_day.items():
+                occupancy[rid][d] += n
+                per_day_totals[d] += n
+
     total_rooms = len(rooms)
 
     participants_gender = {"male": 0, "female": 0, "unknown": 0}
-    for p in participants:
-        g = p.get("gender") or "unknown"
-        if g not in participants_gender:
-            g = "unknown"
-        participants_gender[g] += 1
+    for row in genders:
+        g = row["_id"] if row["_id"] in participants_gender else "unknown"
+        participants_gender[g] += row["n"]
+    total_participants = sum(participants_gender.values())
 
-    per_day_remaining = {d: max(per_day_capacity[d] - per_day_totals[d], 0) for d in [1, 2, 3]}
+    per_day_remaining = {d: max(per_day_capacity[d] - per_day_totals[d], 0) for d in _DAYS}
 
     return {
         "totals": {
@@ -351,7 +569,7 @@ def summary():
             "assigned": per_day_totals,
             "remaining": per_day_remaining
         },
-        "occupancy": occupancy
+        "occupancy": {str(rid): room_occ for rid, room_occ in occupancy.items()}
     }
 
 
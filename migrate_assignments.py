@@ -0,0 +1,39 @@
+"""
+One-off migration for assignments written by older versions of the API
+
+- room_id / participant_id were stored as hex strings; convert them to ObjectId
+- stay_days_mask did not exist; backfill it from stay_days (bit 0 = day 1)
+
+Safe to re-run: each step only touches documents still in the old shape.
+Usage: python migrate_assignments.py
+"""
+
+import asyncio
+
+from database import db
+
+
+async def migrate_assignments():
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    res = await db.assignment.update_many(
+        {"room_id": {"$type": "string"}}, [{"$set": {"room_id": {"$toObjectId": "$room_id"}}}]
+    )
+    print(f"room_id converted: {res.modified_count}")
+
+    res = await db.assignment.update_many(
+        {"participant_id": {"$type": "string"}}, [{"$set": {"participant_id": {"$toObjectId": "$participant_id"}}}]
+    )
+    print(f"participant_id converted: {res.modified_count}")
+
+    res = await db.assignment.update_many({"stay_days_mask": {"$exists": False}}, [{"$set": {"stay_days_mask": {"$reduce": {
+        "input": {"$setUnion": [{"$ifNull": ["$stay_days", []]}, []]},
+        "initialValue": 0,
+        "in": {"$add": ["$$value", {"$pow": [2, {"$subtract": ["$$this", 1]}]}]},
+    }}}}])
+    print(f"stay_days_mask backfilled: {res.modified_count}")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_assignments())
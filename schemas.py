@@ -8,8 +8,31 @@ Collection name is the lowercase of the class name:
 - Assignment -> "assignment"
 """
 
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Literal
+import re
+from pydantic import AfterValidator, BaseModel, BeforeValidator, Field, EmailStr, conint
+from typing import Annotated, List, Optional, Literal
+
+OID_RE = re.compile(r"[0-9a-fA-F]{24}")
+
+
+def _validate_oid(v):
+    s = str(v)
+    if not OID_RE.fullmatch(s):
+        raise ValueError("Invalid ObjectId string")
+    return s
+
+
+# Hex ObjectId carried as a plain string
+ObjectIdStr = Annotated[str, BeforeValidator(_validate_oid)]
+
+def _validate_unique_days(v):
+    if len(set(v)) != len(v):
+        raise ValueError("Duplicate days")
+    return v
+
+
+# Days of the 3-day retreat a participant stays, each listed once
+StayDays = Annotated[List[conint(ge=1, le=3)], Field(min_length=1, max_length=3), AfterValidator(_validate_unique_days)]
 
 class Room(BaseModel):
     """
@@ -41,9 +64,9 @@ class Assignment(BaseModel):
     Assign a participant to a room for specific days of the 3-day retreat
     stay_days: list of day numbers in {1,2,3}
     """
-    participant_id: str = Field(..., description="Participant ObjectId as string")
-    room_id: str = Field(..., description="Room ObjectId as string")
-    stay_days: List[int] = Field(..., description="Days assigned (subset of [1,2,3])")
+    participant_id: ObjectIdStr = Field(..., description="Participant ObjectId as string")
+    room_id: ObjectIdStr = Field(..., description="Room ObjectId as string")
+    stay_days: StayDays = Field(..., description="Days assigned (subset of [1,2,3])")
 
 # Note:
 # - Use these schemas to structure and validate data.